@@ -65,7 +65,127 @@ def read_parse_args() -> argparse.Namespace:
         env_var='HISTORY_FILEPATH',
         default=defaults.HISTORY_FILEPATH,
         help=f'Путь к файлу для сохранения истории переписки'
-    )    
+    )
+    parser.add(
+        '--nicknames-filepath',
+        metavar='FILEPATH',
+        type=str,
+        env_var='NICKNAMES_FILEPATH',
+        default='',
+        help='Путь к файлу с никами для пакетной регистрации, по одному в строке'
+    )
+    parser.add(
+        '--tokens-filepath',
+        metavar='FILEPATH',
+        type=str,
+        env_var='TOKENS_FILEPATH',
+        default=defaults.TOKENS_FILEPATH,
+        help='Путь к файлу .jsonl или .csv для токенов, полученных при пакетной регистрации'
+    )
+    parser.add(
+        '--concurrency',
+        type=int,
+        env_var='CONCURRENCY',
+        default=defaults.CONCURRENCY,
+        help='Число одновременных регистраций при пакетной регистрации'
+    )
+    parser.add(
+        '--retries',
+        type=int,
+        env_var='RETRIES',
+        default=defaults.RETRIES,
+        help='Число повторных попыток регистрации одного пользователя'
+    )
+    parser.add(
+        '--capture-filepath',
+        metavar='FILEPATH',
+        type=str,
+        env_var='CAPTURE_FILEPATH',
+        default=defaults.CAPTURE_FILEPATH,
+        help='Путь к файлу для записи принятых из чата данных'
+    )
+    parser.add(
+        '--replay-filepath',
+        metavar='FILEPATH',
+        type=str,
+        env_var='REPLAY_FILEPATH',
+        default=defaults.REPLAY_FILEPATH,
+        help='Путь к файлу захвата, который нужно воспроизвести вместо подключения к чату'
+    )
+    parser.add(
+        '--replay-speed',
+        type=float,
+        env_var='REPLAY_SPEED',
+        default=defaults.REPLAY_SPEED,
+        help='Во сколько раз ускорить воспроизведение; 0 - воспроизводить без пауз'
+    )
+    parser.add(
+        '--metrics-host',
+        type=str,
+        env_var='METRICS_HOST',
+        default=defaults.METRICS_HOST,
+        help='Хост для публикации метрик в формате Prometheus'
+    )
+    parser.add(
+        '--metrics-port',
+        type=int,
+        env_var='METRICS_PORT',
+        default=defaults.METRICS_PORT,
+        help='Порт для публикации метрик в формате Prometheus; 0 - не публиковать'
+    )
+    parser.add(
+        '--metrics-filepath',
+        metavar='FILEPATH',
+        type=str,
+        env_var='METRICS_FILEPATH',
+        default=defaults.METRICS_FILEPATH,
+        help='Путь к файлу для периодической записи метрик в формате JSON'
+    )
+    parser.add(
+        '--metrics-interval',
+        type=float,
+        env_var='METRICS_DUMP_INTERVAL',
+        default=defaults.METRICS_DUMP_INTERVAL,
+        help='Интервал записи метрик в файл в секундах'
+    )
+    parser.add(
+        '--profile',
+        action='store_true',
+        env_var='PROFILE',
+        help='Включить режим профилирования'
+    )
+    parser.add(
+        '--profile-filepath',
+        metavar='FILEPATH',
+        type=str,
+        env_var='PROFILE_FILEPATH',
+        default=defaults.PROFILE_FILEPATH,
+        help='Путь к файлу для отчёта профилирования'
+    )
+    parser.add(
+        '--profile-slow-callback',
+        metavar='SECONDS',
+        type=float,
+        env_var='PROFILE_SLOW_CALLBACK_DURATION',
+        default=defaults.PROFILE_SLOW_CALLBACK_DURATION,
+        help='Длительность колбэка цикла событий, после которой он считается медленным, в секундах'
+    )
+    parser.add(
+        '--profile-snapshot-interval',
+        metavar='SECONDS',
+        type=float,
+        env_var='PROFILE_SNAPSHOT_INTERVAL',
+        default=defaults.PROFILE_SNAPSHOT_INTERVAL,
+        help='Интервал снимков распределения памяти в секундах'
+    )
+    parser.add(
+        '--profile-top',
+        metavar='N',
+        type=int,
+        env_var='PROFILE_SNAPSHOT_TOP',
+        default=defaults.PROFILE_SNAPSHOT_TOP,
+        help='Число строк кода с наибольшим выделением памяти в каждом снимке'
+    )
     args = parser.parse_args()
     if not args.token:
         args.token = read_token_from_file()
@@ -4,9 +4,13 @@
 
 import asyncio
 import json
+import time
 from asyncio.streams import StreamReader, StreamWriter
 from contextlib import suppress
+from typing import Optional
 
+import metrics
+import startup
 from connections import close_connection, open_connection, submit_message
 from exceptions import InvalidToken
 from gui import NicknameReceived, SendingConnectionStateChanged
@@ -14,15 +18,19 @@ from gui import NicknameReceived, SendingConnectionStateChanged
 
 async def authorize(reader: StreamReader, writer: StreamWriter, token: str) -> str:
     """Авторизует пользователя в чате."""
+    started_at = time.perf_counter()
     await reader.readline()
     await submit_message(writer, token)
 
-    with suppress(json.decoder.JSONDecodeError):
-        host_response = await reader.readline()
-        account_parameters = json.loads(host_response)
-        if account_parameters:
-            return account_parameters['nickname']
-    return ''
+    try:
+        with suppress(json.decoder.JSONDecodeError):
+            host_response = await reader.readline()
+            account_parameters = json.loads(host_response)
+            if account_parameters:
+                return account_parameters['nickname']
+        return ''
+    finally:
+        metrics.AUTHORIZATION_SECONDS.observe(time.perf_counter() - started_at)
 
 
 async def check_token(
@@ -31,9 +39,13 @@ async def check_token(
     token: str,
     queue: asyncio.Queue,
     status_update_queue: asyncio.Queue,
-    watchdog_queue: asyncio.Queue
+    watchdog_queue: asyncio.Queue,
+    history_loaded: Optional[asyncio.Event] = None
 ) -> None:
-    """Проверяет корректность токена."""
+    """Проверяет корректность токена.
+
+    Если передано событие history_loaded, сообщение об авторизации попадает в очередь только после загрузки истории.
+    """
     if not token:
         raise InvalidToken('Токен не указан', 'Укажите токен, без него работа с чатом невозможна')
 
@@ -48,8 +60,11 @@ async def check_token(
         await close_connection(writer, status_update_queue, SendingConnectionStateChanged)
 
     if nickname:
-        queue.put_nowait(f'Выполнена авторизация. Пользователь {nickname}.')
         status_update_queue.put_nowait(NicknameReceived(nickname))
+        if history_loaded:
+            await history_loaded.wait()
+        queue.put_nowait(f'Выполнена авторизация. Пользователь {nickname}.')
+        startup.mark('авторизация')
         watchdog_queue.put_nowait('Authorization done')
         return
 
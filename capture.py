@@ -0,0 +1,63 @@
+# coding=utf-8
+
+"""Запись принятых из чата байтов в файл захвата и чтение таких файлов."""
+
+import struct
+import time
+from typing import BinaryIO, Iterator, Tuple
+
+from exceptions import CaptureFileError
+
+CAPTURE_HEADER = b'MINECHAT-CAPTURE 1\n'
+RECORD_HEADER = struct.Struct('<dI')
+
+
+class CaptureWriter:
+    """Дописывает в файл записи вида: время получения, длина, байты сообщения."""
+
+    def __init__(self, filepath: str) -> None:
+        self.file_handler: BinaryIO = open(filepath, 'ab')
+        if not self.file_handler.tell():
+            self.file_handler.write(CAPTURE_HEADER)
+
+    def write(self, chat_message: bytes) -> None:
+        self.file_handler.write(RECORD_HEADER.pack(time.time(), len(chat_message)))
+        self.file_handler.write(chat_message)
+
+    def close(self) -> None:
+        self.file_handler.close()
+
+
+def open_capture(filepath: str) -> CaptureWriter:
+    """Открывает файл захвата для записи или сообщает, почему это невозможно."""
+    try:
+        return CaptureWriter(filepath)
+    except OSError as ex:
+        raise CaptureFileError('Файл захвата', f'Не удалось открыть файл {filepath} для записи: {ex.strerror}')
+
+
+def check_capture(filepath: str) -> None:
+    """Проверяет, что файл существует и является файлом захвата чата."""
+    try:
+        with open(filepath, 'rb') as file_handler:
+            header = file_handler.read(len(CAPTURE_HEADER))
+    except OSError as ex:
+        raise CaptureFileError('Файл захвата', f'Не удалось открыть файл {filepath}: {ex.strerror}')
+    if header != CAPTURE_HEADER:
+        raise CaptureFileError('Файл захвата', f'{filepath} не является файлом захвата чата')
+
+
+def read_capture(filepath: str) -> Iterator[Tuple[float, bytes]]:
+    """Возвращает записи из файла захвата в порядке их получения."""
+    with open(filepath, 'rb') as file_handler:
+        if file_handler.read(len(CAPTURE_HEADER)) != CAPTURE_HEADER:
+            raise ValueError(f'{filepath} не является файлом захвата чата')
+        while True:
+            record_header = file_handler.read(RECORD_HEADER.size)
+            if len(record_header) < RECORD_HEADER.size:
+                return
+            timestamp, length = RECORD_HEADER.unpack(record_header)
+            chat_message = file_handler.read(length)
+            if len(chat_message) < length:
+                return
+            yield timestamp, chat_message
@@ -3,33 +3,87 @@
 """Функции для чтения сообщений чата."""
 
 import asyncio
+from typing import Optional
 
+import metrics
+import startup
+from capture import CaptureWriter, read_capture
 from connections import close_connection, open_connection
 from gui import ReadConnectionStateChanged
 
 READER_SLEEP_INTERVAL = 1 / 120
 
 
+def put_message_to_queues(
+    chat_message: bytes,
+    queue: asyncio.Queue,
+    file_queue: asyncio.Queue,
+    errors: str = 'strict'
+) -> None:
+    """Декодирует сообщение чата и записывает его в очереди."""
+    message = chat_message.decode(errors=errors).rstrip()
+
+    metrics.MESSAGES_RECEIVED.inc()
+    queue.put_nowait(message)
+    file_queue.put_nowait(message)
+    startup.mark(startup.FIRST_MESSAGE_STAGE)
+
+
 async def read_messages(
     host: str,
     port: int,
     queue: asyncio.Queue,
     file_queue: asyncio.Queue,
     status_update_queue: asyncio.Queue,
-    watchdog_queue: asyncio.Queue
+    watchdog_queue: asyncio.Queue,
+    capture_writer: Optional[CaptureWriter] = None,
+    history_loaded: Optional[asyncio.Event] = None
 ) -> None:
-    """Читает сообщения из чата и записывает их в очереди."""
+    """Читает сообщения из чата и записывает их в очереди, а при необходимости и в файл захвата.
+
+    Если передано событие history_loaded, сообщения попадают в очереди только после загрузки истории.
+    """
     reader, writer = await open_connection(host, port, status_update_queue, ReadConnectionStateChanged)
+    startup.mark('соединение для чтения')
     try:
+        if history_loaded:
+            await history_loaded.wait()
         while True:
             chat_message = await reader.readline()
-            message = chat_message.decode().rstrip()
+            if capture_writer and chat_message:
+                capture_writer.write(chat_message)
 
-            queue.put_nowait(message)
-            file_queue.put_nowait(message)
+            put_message_to_queues(chat_message, queue, file_queue)
             watchdog_queue.put_nowait('New message in chat')
             await asyncio.sleep(READER_SLEEP_INTERVAL)
     except asyncio.CancelledError:
         raise
     finally:
         await close_connection(writer, status_update_queue, ReadConnectionStateChanged)
+
+
+async def replay_messages(
+    filepath: str,
+    speed: float,
+    queue: asyncio.Queue,
+    file_queue: asyncio.Queue,
+    status_update_queue: asyncio.Queue,
+    history_loaded: Optional[asyncio.Event] = None
+) -> None:
+    """Записывает в очереди сообщения из файла захвата с исходными интервалами, ускоренными в speed раз.
+
+    При нулевой скорости сообщения воспроизводятся без пауз.
+    """
+    if history_loaded:
+        await history_loaded.wait()
+    loop = asyncio.get_running_loop()
+    status_update_queue.put_nowait(ReadConnectionStateChanged.ESTABLISHED)
+    first_timestamp, started_at = None, loop.time()
+    for timestamp, chat_message in read_capture(filepath):
+        if first_timestamp is None:
+            first_timestamp = timestamp
+        delay = started_at + (timestamp - first_timestamp) / speed - loop.time() if speed else 0
+        await asyncio.sleep(max(delay, 0))
+
+        put_message_to_queues(chat_message, queue, file_queue, errors='replace')
+    status_update_queue.put_nowait(ReadConnectionStateChanged.CLOSED)
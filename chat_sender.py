@@ -4,6 +4,7 @@
 
 import asyncio
 
+import metrics
 from authorizer import authorize
 from connections import close_connection, open_connection, submit_message
 from gui import SendingConnectionStateChanged
@@ -35,6 +36,8 @@ async def send_messages(
             status_update_queue.put_nowait(SendingConnectionStateChanged.ESTABLISHED)
             message = await queue.get()
             await submit_message(writer, message)
+            if message:
+                metrics.MESSAGES_SENT.inc()
 
             watchdog_queue.put_nowait('Message sent')
             await asyncio.sleep(SENDER_SLEEP_INTERVAL)
@@ -4,11 +4,13 @@
 
 import asyncio
 import socket
+import time
 from asyncio.streams import StreamReader, StreamWriter
 from typing import Type, TypeVar
 
 import async_timeout
 
+import metrics
 from gui import ReadConnectionStateChanged, SendingConnectionStateChanged
 
 
@@ -26,9 +28,11 @@ async def open_connection(
 ) -> (StreamReader, StreamWriter):
     """Устанавливает соединение с сервером по указанным хосту и порту."""
     status_update_queue.put_nowait(gui_state_class.INITIATED)
+    started_at = time.perf_counter()
     try:
         async with async_timeout.timeout(WAIT_CONNECTION_SLEEP_INTERVAL):
             reader, writer = await asyncio.open_connection(host, port)
+        metrics.CONNECTION_OPEN_SECONDS.observe(time.perf_counter() - started_at)
         status_update_queue.put_nowait(gui_state_class.ESTABLISHED)
         return reader, writer
     except (ConnectionRefusedError, ConnectionResetError, socket.gaierror, asyncio.exceptions.TimeoutError, OSError):
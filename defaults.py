@@ -2,9 +2,23 @@
 
 """Параметры по умолчанию для программы."""
 
+CAPTURE_FILEPATH = ''
+CONCURRENCY = 10
 HISTORY_FILEPATH = 'history.txt'
+METRICS_DUMP_INTERVAL = 10
+METRICS_FILEPATH = ''
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = 0
+PROFILE_FILEPATH = 'profile_report.txt'
+PROFILE_SLOW_CALLBACK_DURATION = 0.1
+PROFILE_SNAPSHOT_INTERVAL = 30
+PROFILE_SNAPSHOT_TOP = 10
 READER_HOST = 'minechat.dvmn.org'
 READER_PORT = 5000
+REPLAY_FILEPATH = ''
+REPLAY_SPEED = 1
+RETRIES = 3
 SENDER_HOST = 'minechat.dvmn.org'
 SENDER_PORT = 5050
+TOKENS_FILEPATH = 'user_tokens.jsonl'
 USER_TOKEN_FILE = 'user_token.json'
@@ -12,6 +12,13 @@ class InvalidToken(Exception):
         super().__init__(title)
 
 
+class CaptureFileError(Exception):
+    def __init__(self, title: str, message: Optional[str] = '') -> None:
+        self.title = title
+        self.message = message
+        super().__init__(title)
+
+
 class RegistrationError(Exception):
     def __init__(self) -> None:
         self.title = 'Регистрация пользователя'
@@ -1,10 +1,15 @@
 import tkinter as tk
 import asyncio
+import time
 from tkinter.scrolledtext import ScrolledText
 from enum import Enum
 
 import anyio
 
+import metrics
+import profiler
+import startup
+
 
 class TkAppClosed(Exception):
     pass
@@ -41,11 +46,14 @@ def process_new_message(input_field, sending_queue):
 
 async def update_tk(root_frame, interval=1 / 120):
     while True:
+        started_at = time.perf_counter()
         try:
             root_frame.update()
         except tk.TclError:
             # if application has been destroyed/closed
             raise TkAppClosed()
+        metrics.TK_FRAME_SECONDS.observe(time.perf_counter() - started_at)
+        startup.mark('первая отрисовка')
         await asyncio.sleep(interval)
 
 
@@ -103,6 +111,8 @@ def create_status_panel(root_frame):
 
 
 async def draw(messages_queue, sending_queue, status_updates_queue):
+    # let connections and history loading start before the window is built
+    await asyncio.sleep(0)
     root = tk.Tk()
 
     root.title('Чат Майнкрафтера')
@@ -127,8 +137,9 @@ async def draw(messages_queue, sending_queue, status_updates_queue):
 
     conversation_panel = ScrolledText(root_frame, wrap='none')
     conversation_panel.pack(side="top", fill="both", expand=True)
+    startup.mark('окно')
 
     async with anyio.create_task_group() as task_group:
-        task_group.start_soon(update_tk, root_frame)
-        task_group.start_soon(update_conversation_history, conversation_panel, messages_queue)
-        task_group.start_soon(update_status_panel, status_labels, status_updates_queue)
+        task_group.start_soon(profiler.profiled(update_tk), root_frame)
+        task_group.start_soon(profiler.profiled(update_conversation_history), conversation_panel, messages_queue)
+        task_group.start_soon(profiler.profiled(update_status_panel), status_labels, status_updates_queue)
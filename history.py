@@ -3,25 +3,56 @@
 """Функции для работы с файлом сохранения истории сообщений."""
 
 import asyncio
-from contextlib import suppress
+import os
+import time
+from typing import Optional
 
-import aiofiles
+import metrics
+import startup
 
 HISTORY_SLEEP_INTERVAL = 1 / 120
+HISTORY_TAIL_SIZE = 64 * 1024
 
 
-def put_history_to_queue(filepath: str, queue: asyncio.Queue) -> None:
-    """Создаёт очередь сообщений и помещает в неё сообщения из файла."""
-    with suppress(FileNotFoundError):
-        with open(filepath, 'r', encoding='UTF8') as file_handler:
+def read_history_tail(filepath: str, size: int = HISTORY_TAIL_SIZE) -> Optional[str]:
+    """Читает последние целые строки файла истории, занимающие не больше size байт."""
+    try:
+        with open(filepath, 'rb') as file_handler:
+            file_size = file_handler.seek(0, os.SEEK_END)
+            file_handler.seek(max(file_size - size, 0))
             messages = file_handler.read()
-        queue.put_nowait(messages)
+    except FileNotFoundError:
+        return None
+    if file_size > size:
+        messages = messages.partition(b'\n')[2]
+    return messages.decode('UTF8', errors='replace')
+
+
+async def put_history_to_queue(filepath: str, queue: asyncio.Queue, history_loaded: asyncio.Event) -> None:
+    """Помещает в очередь конец файла истории, читая его в отдельном потоке."""
+    try:
+        messages = await asyncio.get_running_loop().run_in_executor(None, read_history_tail, filepath)
+        if messages is not None:
+            queue.put_nowait(messages)
+        startup.mark('история')
+    finally:
+        history_loaded.set()
 
 
 async def save_messages(filepath: str, queue: asyncio.Queue) -> None:
-    """Записывает сообщения в текстовый файл, находящийся по указанному пути."""
+    """Записывает сообщения в текстовый файл, находящийся по указанному пути.
+
+    aiofiles импортируется только после первого сообщения, чтобы не замедлять появление окна.
+    """
+    message = await queue.get()
+    import aiofiles
+
     while True:
-        message = await queue.get()
+        line = f'{message}\n'
+        started_at = time.perf_counter()
         async with aiofiles.open(filepath, 'a', encoding='UTF8') as file_handler:
-            await file_handler.write(f'{message}\n')
+            await file_handler.write(line)
+        metrics.HISTORY_WRITE_SECONDS.observe(time.perf_counter() - started_at)
+        metrics.HISTORY_WRITTEN_BYTES.inc(len(line.encode()))
         await asyncio.sleep(HISTORY_SLEEP_INTERVAL)
+        message = await queue.get()
@@ -2,42 +2,82 @@
 
 """Запуск графического интерфейса пользователя чата."""
 
+import startup  # импортируется первым, чтобы учесть время остальных импортов
 import asyncio
 from contextlib import suppress
-from tkinter import messagebox
 
 import anyio
 
 import gui
+import metrics
+import profiler
 from args_parser import read_parse_args
-from exceptions import InvalidToken
+from capture import check_capture, open_capture
+from chat_reader import replay_messages
+from exceptions import CaptureFileError, InvalidToken
 from history import put_history_to_queue, save_messages
 from watchdog import handle_connection
 
 
 async def main() -> None:
     """Инициализирует переменные и запускает программу ."""
+    startup.mark('импорт модулей')
     args = read_parse_args()
+    startup.mark('аргументы')
+    if args.profile:
+        profiler.enable(args.profile_filepath, args.profile_slow_callback, args.profile_snapshot_interval,
+                        args.profile_top)
 
     messages_queue = asyncio.Queue()
     file_queue = asyncio.Queue()
     sending_queue = asyncio.Queue()
     status_updates_queue = asyncio.Queue()
     watchdog_queue = asyncio.Queue()
+    history_loaded = asyncio.Event()
 
-    put_history_to_queue(args.history_filepath, messages_queue)
+    capture_writer = None
+    if args.replay_filepath:
+        check_capture(args.replay_filepath)
+    elif args.capture_filepath:
+        capture_writer = open_capture(args.capture_filepath)
 
-    async with anyio.create_task_group() as task_group:
-        task_group.start_soon(gui.draw, messages_queue, sending_queue, status_updates_queue)
-        task_group.start_soon(save_messages, args.history_filepath, file_queue)
-        task_group.start_soon(handle_connection, args.reader_host, args.reader_port, args.sender_host, args.sender_port,
-                              args.token, messages_queue, sending_queue, file_queue, status_updates_queue,
-                              watchdog_queue)
+    metrics.track_queue('messages', messages_queue)
+    metrics.track_queue('file', file_queue)
+    metrics.track_queue('sending', sending_queue)
+    metrics.track_queue('status_updates', status_updates_queue)
+    metrics.track_queue('watchdog', watchdog_queue)
+
+    try:
+        async with anyio.create_task_group() as task_group:
+            if args.replay_filepath:
+                task_group.start_soon(profiler.profiled(replay_messages), args.replay_filepath, args.replay_speed,
+                                      messages_queue, file_queue, status_updates_queue, history_loaded)
+            else:
+                task_group.start_soon(profiler.profiled(handle_connection), args.reader_host, args.reader_port,
+                                      args.sender_host, args.sender_port, args.token, messages_queue, sending_queue,
+                                      file_queue, status_updates_queue, watchdog_queue, capture_writer,
+                                      history_loaded)
+            task_group.start_soon(profiler.profiled(put_history_to_queue), args.history_filepath, messages_queue,
+                                  history_loaded)
+            task_group.start_soon(profiler.profiled(gui.draw), messages_queue, sending_queue, status_updates_queue)
+            task_group.start_soon(profiler.profiled(save_messages), args.history_filepath, file_queue)
+            if args.metrics_port:
+                task_group.start_soon(metrics.serve_metrics, args.metrics_host, args.metrics_port)
+            if args.metrics_filepath:
+                task_group.start_soon(metrics.dump_metrics, args.metrics_filepath, args.metrics_interval)
+            if args.profile:
+                task_group.start_soon(profiler.take_snapshots)
+    finally:
+        if capture_writer:
+            capture_writer.close()
 
 
 if __name__ == '__main__':
     try:
         with suppress(gui.TkAppClosed, KeyboardInterrupt):
             asyncio.run(main())
-    except InvalidToken as ex:
+    except (InvalidToken, CaptureFileError) as ex:
+        from tkinter import messagebox
         messagebox.showinfo(title=ex.title, message=ex.message)
+    finally:
+        profiler.write_report()
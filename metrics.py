@@ -0,0 +1,182 @@
+# coding=utf-8
+
+"""Метрики работы клиента и их публикация по HTTP и в файл."""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Callable, Dict, List, Tuple
+
+import async_timeout
+
+METRICS_REQUEST_TIMEOUT = 5
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+JSON_CONTENT_TYPE = 'application/json; charset=utf-8'
+
+
+metrics_logger = logging.getLogger('metrics')
+
+
+class Counter:
+    """Монотонно растущий счётчик."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, description: str) -> None:
+        self.name = name
+        self.description = description
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def collect(self) -> List[Tuple[str, float]]:
+        return [(self.name, self.value)]
+
+
+class Summary:
+    """Количество и сумма наблюдаемых величин, например длительностей."""
+
+    kind = 'summary'
+
+    def __init__(self, name: str, description: str) -> None:
+        self.name = name
+        self.description = description
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+
+    def collect(self) -> List[Tuple[str, float]]:
+        return [(f'{self.name}_count', self.count), (f'{self.name}_sum', self.sum)]
+
+
+class Gauge:
+    """Мгновенное значение, которое вычисляется в момент сбора метрик."""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, description: str, label: str) -> None:
+        self.name = name
+        self.description = description
+        self.label = label
+        self.sources: Dict[str, Callable[[], float]] = {}
+
+    def track(self, label_value: str, source: Callable[[], float]) -> None:
+        self.sources[label_value] = source
+
+    def collect(self) -> List[Tuple[str, float]]:
+        return [
+            (f'{self.name}{{{self.label}="{label_value}"}}', source())
+            for label_value, source in self.sources.items()
+        ]
+
+
+MESSAGES_RECEIVED = Counter('chat_messages_received_total', 'Сообщения, полученные из чата')
+MESSAGES_SENT = Counter('chat_messages_sent_total', 'Сообщения, отправленные в чат')
+QUEUE_SIZE = Gauge('chat_queue_size', 'Число элементов в очереди', 'queue')
+HISTORY_WRITE_SECONDS = Summary('chat_history_write_seconds', 'Время записи сообщения в файл истории')
+HISTORY_WRITTEN_BYTES = Counter('chat_history_written_bytes_total', 'Байты, записанные в файл истории')
+CONNECTION_OPEN_SECONDS = Summary('chat_connection_open_seconds', 'Время установки соединения с сервером')
+AUTHORIZATION_SECONDS = Summary('chat_authorization_seconds', 'Время авторизации пользователя')
+RECONNECTS = Counter('chat_reconnects_total', 'Переподключения к серверу')
+TK_FRAME_SECONDS = Summary('chat_tk_frame_seconds', 'Время отрисовки кадра Tk')
+
+REGISTRY = (
+    MESSAGES_RECEIVED,
+    MESSAGES_SENT,
+    QUEUE_SIZE,
+    HISTORY_WRITE_SECONDS,
+    HISTORY_WRITTEN_BYTES,
+    CONNECTION_OPEN_SECONDS,
+    AUTHORIZATION_SECONDS,
+    RECONNECTS,
+    TK_FRAME_SECONDS,
+)
+
+
+def track_queue(name: str, queue: asyncio.Queue) -> None:
+    """Добавляет очередь в метрику размеров очередей."""
+    QUEUE_SIZE.track(name, queue.qsize)
+
+
+def collect_samples() -> Dict[str, float]:
+    """Возвращает текущие значения всех метрик."""
+    return {name: value for metric in REGISTRY for name, value in metric.collect()}
+
+
+def format_prometheus() -> str:
+    """Возвращает метрики в текстовом формате Prometheus."""
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f'# HELP {metric.name} {metric.description}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        lines.extend(f'{name} {value}' for name, value in metric.collect())
+    return '\n'.join(lines) + '\n'
+
+
+async def handle_metrics_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Отвечает на HTTP-запрос метриками в формате Prometheus или JSON."""
+    try:
+        async with async_timeout.timeout(METRICS_REQUEST_TIMEOUT):
+            request_line = await reader.readline()
+            while (await reader.readline()).strip():
+                pass
+        request_parts = request_line.decode('latin-1').split()
+        path = request_parts[1] if len(request_parts) > 1 else '/'
+
+        if path == '/metrics.json':
+            status, content_type, body = '200 OK', JSON_CONTENT_TYPE, json.dumps(collect_samples())
+        elif path in ('/', '/metrics'):
+            status, content_type, body = '200 OK', PROMETHEUS_CONTENT_TYPE, format_prometheus()
+        else:
+            status, content_type, body = '404 Not Found', PROMETHEUS_CONTENT_TYPE, 'Not Found\n'
+
+        body = body.encode()
+        writer.write(
+            f'HTTP/1.1 {status}\r\n'
+            f'Content-Type: {content_type}\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Connection: close\r\n\r\n'.encode() + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_metrics(host: str, port: int) -> None:
+    """Публикует метрики по HTTP на указанных хосте и порту, а если это невозможно, работает без них."""
+    try:
+        server = await asyncio.start_server(handle_metrics_request, host, port)
+    except OSError as ex:
+        metrics_logger.warning(f'Не удалось опубликовать метрики на {host}:{port}: {ex}')
+        return
+    async with server:
+        await server.serve_forever()
+
+
+async def dump_metrics(filepath: str, interval: float) -> None:
+    """Периодически дописывает метрики и скорости счётчиков в файл в формате JSON Lines."""
+    previous_samples = collect_samples()
+    previous_time = time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        import aiofiles
+
+        samples = collect_samples()
+        current_time = time.monotonic()
+        elapsed = current_time - previous_time
+        rates = {
+            metric.name: (metric.value - previous_samples[metric.name]) / elapsed
+            for metric in REGISTRY
+            if isinstance(metric, Counter)
+        }
+        record = {'timestamp': time.time(), 'metrics': samples, 'rates_per_second': rates}
+        async with aiofiles.open(filepath, 'a', encoding='UTF8') as file_handler:
+            await file_handler.write(f'{json.dumps(record)}\n')
+        previous_samples, previous_time = samples, current_time
@@ -0,0 +1,174 @@
+# coding=utf-8
+
+"""Режим профилирования: медленные колбэки цикла событий, время корутин и снимки памяти."""
+
+import asyncio
+import functools
+import linecache
+import logging
+import os
+import reprlib
+import time
+import traceback
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, Generator, List, Optional
+
+
+# Выделения памяти самим профилированием и отладочным режимом asyncio, которые не нужны в отчёте
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, traceback.__file__),
+    tracemalloc.Filter(False, reprlib.__file__),
+    tracemalloc.Filter(False, os.path.join(os.path.dirname(asyncio.__file__), '*')),
+]
+
+
+class CoroutineStats:
+    """Суммарное время работы корутины."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+
+
+class TimedCoroutine:
+    """Выполняет корутину по шагам и считает процессорное время каждого шага."""
+
+    def __init__(self, coroutine: Awaitable, stats: CoroutineStats) -> None:
+        self.coroutine = coroutine
+        self.stats = stats
+
+    def __await__(self) -> Generator:
+        value, exception = None, None
+        while True:
+            started_at = time.thread_time()
+            try:
+                if exception is None:
+                    future = self.coroutine.send(value)
+                else:
+                    future = self.coroutine.throw(exception)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self.stats.cpu_time += time.thread_time() - started_at
+            try:
+                value, exception = (yield future), None
+            except GeneratorExit:
+                self.coroutine.close()
+                raise
+            except BaseException as ex:
+                value, exception = None, ex
+
+
+class SlowCallbackHandler(logging.Handler):
+    """Собирает сообщения asyncio о медленных колбэках."""
+
+    def __init__(self, records: List[str]) -> None:
+        super().__init__(logging.WARNING)
+        self.records = records
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message = record.getMessage()
+        if message.startswith('Executing '):
+            self.records.append(f'[{int(record.created)}] {message}')
+
+
+class Profiler:
+    """Накапливает результаты профилирования и записывает отчёт."""
+
+    def __init__(self, filepath: str, slow_callback_duration: float, snapshot_interval: float, top: int) -> None:
+        self.filepath = filepath
+        self.slow_callback_duration = slow_callback_duration
+        self.snapshot_interval = snapshot_interval
+        self.top = top
+        self.coroutine_stats: Dict[str, CoroutineStats] = {}
+        self.slow_callbacks: List[str] = []
+        self.snapshots: List[str] = []
+        self.started_at = time.time()
+
+    def start(self) -> None:
+        """Включает отладочный режим цикла событий и трассировку памяти."""
+        loop = asyncio.get_running_loop()
+        loop.set_debug(True)
+        loop.slow_callback_duration = self.slow_callback_duration
+        logging.getLogger('asyncio').addHandler(SlowCallbackHandler(self.slow_callbacks))
+        tracemalloc.start()
+
+    def wrap(self, coroutine_function: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        """Возвращает корутинную функцию, время работы которой попадёт в отчёт."""
+        stats = self.coroutine_stats.setdefault(coroutine_function.__qualname__, CoroutineStats())
+
+        @functools.wraps(coroutine_function)
+        async def timed(*args: Any) -> Any:
+            stats.calls += 1
+            started_at = time.perf_counter()
+            try:
+                return await TimedCoroutine(coroutine_function(*args), stats)
+            finally:
+                stats.wall_time += time.perf_counter() - started_at
+
+        return timed
+
+    def take_snapshot(self) -> None:
+        """Сохраняет строки кода, выделивших больше всего памяти."""
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        statistics = snapshot.statistics('lineno')[:self.top]
+        lines = [f'[{int(time.time())}] Top {self.top} allocations:']
+        lines.extend(f'    {stat}' for stat in statistics)
+        self.snapshots.append('\n'.join(lines))
+
+    async def take_snapshots(self) -> None:
+        """Периодически делает снимки распределения памяти."""
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            self.take_snapshot()
+
+    def write_report(self) -> None:
+        """Записывает отчёт профилирования в файл."""
+        if tracemalloc.is_tracing():
+            self.take_snapshot()
+            tracemalloc.stop()
+
+        lines = [f'Profiling report, {time.time() - self.started_at:.1f}s total', '', 'Coroutines:']
+        lines.append(f'    {"name":<40} {"calls":>6} {"wall, s":>10} {"cpu, s":>10}')
+        for name, stats in sorted(self.coroutine_stats.items(), key=lambda item: -item[1].cpu_time):
+            lines.append(f'    {name:<40} {stats.calls:>6} {stats.wall_time:>10.3f} {stats.cpu_time:>10.3f}')
+        lines.extend(['', f'Slow callbacks (> {self.slow_callback_duration}s): {len(self.slow_callbacks)}'])
+        lines.extend(f'    {record}' for record in self.slow_callbacks)
+        lines.extend(['', 'Memory snapshots:'])
+        lines.extend(self.snapshots)
+
+        with open(self.filepath, 'w', encoding='UTF8') as report_file:
+            report_file.write('\n'.join(lines) + '\n')
+
+
+_profiler: Optional[Profiler] = None
+
+
+def enable(filepath: str, slow_callback_duration: float, snapshot_interval: float, top: int) -> Profiler:
+    """Включает профилирование в текущем цикле событий."""
+    global _profiler
+    _profiler = Profiler(filepath, slow_callback_duration, snapshot_interval, top)
+    _profiler.start()
+    return _profiler
+
+
+def profiled(coroutine_function: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+    """Оборачивает корутинную функцию для профилирования, если оно включено."""
+    if _profiler is None:
+        return coroutine_function
+    return _profiler.wrap(coroutine_function)
+
+
+async def take_snapshots() -> None:
+    """Периодически делает снимки распределения памяти, если профилирование было включено."""
+    if _profiler is not None:
+        await _profiler.take_snapshots()
+
+
+def write_report() -> None:
+    """Записывает отчёт, если профилирование было включено."""
+    if _profiler is not None:
+        _profiler.write_report()
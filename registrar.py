@@ -1,16 +1,23 @@
 # coding=utf-8
 
-"""Запуск графического интерфейса регистрации нового пользователя в чате."""
+"""Запуск графического интерфейса регистрации нового пользователя в чате или пакетной регистрации."""
 
 import asyncio
+import csv
+import io
 import json
+import logging
+import os
+import time
 import tkinter as tk
 from asyncio.streams import StreamReader, StreamWriter
 from contextlib import suppress
 from tkinter.scrolledtext import ScrolledText
+from typing import List, Tuple
 
 import aiofiles
 import anyio
+import async_timeout
 
 import defaults
 from args_parser import read_parse_args
@@ -19,6 +26,13 @@ from exceptions import RegistrationError
 from gui import SendingConnectionStateChanged, TkAppClosed, update_tk
 
 
+REGISTRATION_BACKOFF = 1
+REGISTRATION_TIMEOUT = 10
+
+
+registrar_logger = logging.getLogger('registrar')
+
+
 def start_register(address_field: tk.Entry, nickname_field: tk.Entry, events_queue: asyncio.Queue) -> None:
     """Посылает сообщение о начале регистрации."""
     server_address = address_field.get()
@@ -106,6 +120,138 @@ async def watch_register(events_queue: asyncio.Queue, log_queue: asyncio.Queue,
             await close_connection(writer, dummy_queue, SendingConnectionStateChanged)
 
 
+async def register_with_retries(host: str, port: int, nickname: str, retries: int) -> dict:
+    """Регистрирует пользователя, повторяя неудачные и зависшие попытки с удваивающейся паузой.
+
+    Ошибка при закрытии соединения после успешной регистрации не приводит к повторной регистрации.
+    """
+    dummy_queue = asyncio.Queue()
+    for attempt in range(retries + 1):
+        writer = None
+        try:
+            async with async_timeout.timeout(REGISTRATION_TIMEOUT):
+                reader, writer = await open_connection(host, port, dummy_queue, SendingConnectionStateChanged)
+                return await register(reader, writer, nickname)
+        except (ConnectionError, UnicodeDecodeError, RegistrationError, asyncio.TimeoutError):
+            if attempt == retries:
+                raise
+        finally:
+            if writer:
+                with suppress(ConnectionError):
+                    await close_connection(writer, dummy_queue, SendingConnectionStateChanged)
+        await asyncio.sleep(REGISTRATION_BACKOFF * 2 ** attempt)
+
+
+def format_token_record(account_parameters: dict, csv_format: bool) -> str:
+    """Возвращает строку для файла токенов в формате CSV или JSON Lines."""
+    if not csv_format:
+        return f'{json.dumps(account_parameters)}\n'
+    line = io.StringIO()
+    csv.writer(line, lineterminator='\n').writerow(
+        [account_parameters.get('nickname', ''), account_parameters.get('account_hash', '')]
+    )
+    return line.getvalue()
+
+
+async def write_tokens(filepath: str, tokens_queue: asyncio.Queue) -> None:
+    """Дописывает параметры зарегистрированных пользователей в файл, пока не получит None."""
+    csv_format = filepath.lower().endswith('.csv')
+    write_header = csv_format and not os.path.exists(filepath)
+    async with aiofiles.open(filepath, 'a', encoding='UTF8', newline='') as tokens_file:
+        if write_header:
+            await tokens_file.write('nickname,account_hash\n')
+        while True:
+            account_parameters = await tokens_queue.get()
+            if account_parameters is None:
+                return
+            await tokens_file.write(format_token_record(account_parameters, csv_format))
+            await tokens_file.flush()
+
+
+async def register_nicknames(
+    host: str,
+    port: int,
+    nicknames_queue: asyncio.Queue,
+    tokens_queue: asyncio.Queue,
+    registered_nicknames: List[str],
+    failed_nicknames: List[str],
+    retries: int
+) -> None:
+    """Регистрирует пользователей из очереди, пока она не опустеет."""
+    while True:
+        try:
+            nickname = nicknames_queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        try:
+            account_parameters = await register_with_retries(host, port, nickname, retries)
+        except (ConnectionError, UnicodeDecodeError, RegistrationError, asyncio.TimeoutError, ValueError):
+            failed_nicknames.append(nickname)
+            registrar_logger.warning(f'Не удалось зарегистрировать {nickname}')
+        else:
+            registered_nicknames.append(nickname)
+            tokens_queue.put_nowait(account_parameters)
+
+
+async def register_batch(
+    host: str,
+    port: int,
+    nicknames: List[str],
+    tokens_filepath: str,
+    concurrency: int,
+    retries: int
+) -> Tuple[int, List[str]]:
+    """Регистрирует пользователей с указанными никами не более чем по concurrency одновременно."""
+    nicknames_queue = asyncio.Queue()
+    for nickname in nicknames:
+        nicknames_queue.put_nowait(nickname)
+    tokens_queue = asyncio.Queue()
+    registered_nicknames = []
+    failed_nicknames = []
+
+    async with anyio.create_task_group() as writer_task_group:
+        writer_task_group.start_soon(write_tokens, tokens_filepath, tokens_queue)
+        async with anyio.create_task_group() as task_group:
+            for _ in range(min(concurrency, len(nicknames))):
+                task_group.start_soon(register_nicknames, host, port, nicknames_queue, tokens_queue,
+                                      registered_nicknames, failed_nicknames, retries)
+        tokens_queue.put_nowait(None)
+
+    return len(registered_nicknames), failed_nicknames
+
+
+def read_nicknames(filepath: str) -> List[str]:
+    """Читает ники из файла, по одному в строке."""
+    with open(filepath, 'r', encoding='UTF8') as nicknames_file:
+        return [nickname for nickname in map(str.strip, nicknames_file) if nickname]
+
+
+async def run_batch(host: str, port: int, nicknames_filepath: str, tokens_filepath: str, concurrency: int,
+                    retries: int) -> None:
+    """Запускает пакетную регистрацию без графического интерфейса и сообщает её итоги."""
+    if concurrency < 1:
+        registrar_logger.error('Число одновременных регистраций должно быть не меньше 1')
+        return
+    if retries < 0:
+        registrar_logger.error('Число повторных попыток не может быть отрицательным')
+        return
+
+    nicknames = read_nicknames(nicknames_filepath)
+    registrar_logger.info(f'Регистрация {len(nicknames)} пользователей на {host}:{port}, '
+                          f'одновременно не более {concurrency}')
+
+    started_at = time.monotonic()
+    registered_count, failed_nicknames = await register_batch(host, port, nicknames, tokens_filepath,
+                                                              concurrency, retries)
+    elapsed = time.monotonic() - started_at
+
+    registrar_logger.info(f'Зарегистрировано {registered_count} из {len(nicknames)} за {elapsed:.1f} с '
+                          f'({registered_count / elapsed if elapsed else 0:.1f} в секунду). '
+                          f'Токены сохранены в файле {tokens_filepath}')
+    if failed_nicknames:
+        registrar_logger.warning(f'Не удалось зарегистрировать {len(failed_nicknames)}: {", ".join(failed_nicknames)}')
+
+
 async def draw(host: str, port: int, events_queue: asyncio.Queue, log_queue: asyncio.Queue) -> None:
     """Рисует интерфейс регистрации пользователя."""
     root = tk.Tk()
@@ -163,6 +309,12 @@ async def main() -> None:
     """Инициализирует переменные и запускает программу ."""
     args = read_parse_args()
 
+    if args.nicknames_filepath:
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+        await run_batch(args.sender_host, args.sender_port, args.nicknames_filepath, args.tokens_filepath,
+                        args.concurrency, args.retries)
+        return
+
     events_queue = asyncio.Queue()
     log_queue = asyncio.Queue()
 
@@ -0,0 +1,24 @@
+# coding=utf-8
+
+"""Замер этапов запуска программы до получения первого сообщения."""
+
+import logging
+import time
+from typing import Dict
+
+STARTED_AT = time.perf_counter()
+FIRST_MESSAGE_STAGE = 'первое сообщение'
+
+
+startup_logger = logging.getLogger('startup')
+stages: Dict[str, float] = {}
+
+
+def mark(stage: str) -> None:
+    """Запоминает время первого завершения этапа запуска и сообщает итоги после первого сообщения."""
+    if stage in stages:
+        return
+    stages[stage] = time.perf_counter() - STARTED_AT
+    if stage == FIRST_MESSAGE_STAGE:
+        report = ', '.join(f'{name} {seconds * 1000:.0f} мс' for name, seconds in stages.items())
+        startup_logger.info(f'Запуск: {report}')
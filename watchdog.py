@@ -6,11 +6,15 @@ import asyncio
 import logging
 import socket
 import time
+from typing import Optional
 
 import anyio
 import async_timeout
 
+import metrics
+import profiler
 from authorizer import check_token
+from capture import CaptureWriter
 from chat_reader import read_messages
 from chat_sender import send_messages
 
@@ -34,7 +38,9 @@ async def handle_connection(
     sending_queue: asyncio.Queue,
     file_queue: asyncio.Queue,
     status_updates_queue: asyncio.Queue,
-    watchdog_queue: asyncio.Queue
+    watchdog_queue: asyncio.Queue,
+    capture_writer: Optional[CaptureWriter] = None,
+    history_loaded: Optional[asyncio.Event] = None
 ) -> None:
     """Управляет группой корутин, зависящих от успешного соединения с сервером."""
     while True:
@@ -42,20 +48,23 @@ async def handle_connection(
             while True:
                 try:
                     async with anyio.create_task_group() as task_group:
-                        task_group.start_soon(check_token, sender_host, sender_port, token,
-                                              messages_queue, status_updates_queue, watchdog_queue)
-                        task_group.start_soon(read_messages, reader_host, reader_port,
-                                              messages_queue, file_queue, status_updates_queue, watchdog_queue)
-                        task_group.start_soon(send_messages, sender_host, sender_port, token,
+                        task_group.start_soon(profiler.profiled(check_token), sender_host, sender_port, token,
+                                              messages_queue, status_updates_queue, watchdog_queue, history_loaded)
+                        task_group.start_soon(profiler.profiled(read_messages), reader_host, reader_port,
+                                              messages_queue, file_queue, status_updates_queue, watchdog_queue,
+                                              capture_writer, history_loaded)
+                        task_group.start_soon(profiler.profiled(send_messages), sender_host, sender_port, token,
                                               sending_queue, status_updates_queue, watchdog_queue)
-                        task_group.start_soon(watch_for_connection, sending_queue, watchdog_queue)
+                        task_group.start_soon(profiler.profiled(watch_for_connection), sending_queue, watchdog_queue)
                 except (socket.gaierror, ConnectionError, UnicodeDecodeError):
                     watchdog_logger.warning('Connection error happened')
+                    metrics.RECONNECTS.inc()
                     raise asyncio.CancelledError
                 except anyio.ExceptionGroup as exception_group:
                     for exception in exception_group.exceptions:
                         if isinstance(exception, (socket.gaierror, ConnectionError)):
                             watchdog_logger.warning('Connection error happened')
+                            metrics.RECONNECTS.inc()
                             raise asyncio.CancelledError
                     raise
         except asyncio.CancelledError: